@@ -10,14 +10,46 @@ import os
 import tempfile
 from datetime import datetime
 from pathlib import Path
+import atexit
 import base64
+import collections
+import concurrent.futures
+import logging
+import stat
 import sys
+import threading
+import time
+import uuid
+import weakref
 
 # Debug info for deployment troubleshooting
 # st.sidebar.write(f"Python: {sys.version}")
 # st.sidebar.write(f"Streamlit: {st.__version__}")
 # st.sidebar.write(f"Pandas: {pd.__version__}")
 
+def read_int_setting(name, default):
+    """Read an integer setting from the environment, falling back to the default"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logging.getLogger(__name__).warning("Invalid %s=%r, using default %s", name, value, default)
+        return default
+
+# Session memory limits (override with environment variables)
+SESSION_IDLE_TIMEOUT_SECONDS = read_int_setting('SENTI_SESSION_IDLE_TIMEOUT', 15 * 60)
+SESSION_MEMORY_BUDGET_MB = read_int_setting('SENTI_SESSION_MEMORY_BUDGET_MB', 256)
+SESSION_SWEEP_INTERVAL_SECONDS = 60
+
+# Background write limits
+BACKGROUND_WRITE_QUEUE_SIZE = 64
+BACKGROUND_WRITE_TIMEOUT_SECONDS = 5
+BACKGROUND_WRITE_SHUTDOWN_TIMEOUT_SECONDS = 30
+BACKGROUND_WRITE_STATUS_TTL_SECONDS = 5 * 60
+BACKGROUND_WRITE_STATUS_REFRESH_SECONDS = 2
+
 # Page configuration
 st.set_page_config(
     page_title="Senti-Nalysis - Sentiment Labeling Tool",
@@ -95,12 +127,10 @@ def init_session_state():
     """Initialize all session state variables"""
     if 'stage' not in st.session_state:
         st.session_state.stage = 'check_resume'  # check_resume, file_selection, labeling, complete
-    if 'csv_data' not in st.session_state:
-        st.session_state.csv_data = None
+    if 'session_data' not in st.session_state:
+        st.session_state.session_data = SessionData()
     if 'current_index' not in st.session_state:
         st.session_state.current_index = 0
-    if 'user_labels' not in st.session_state:
-        st.session_state.user_labels = []
     if 'username' not in st.session_state:
         st.session_state.username = ''
     if 'selected_file' not in st.session_state:
@@ -114,6 +144,202 @@ def init_session_state():
     if 'progress_session_id' not in st.session_state:
         st.session_state.progress_session_id = None
 
+# Background persistence
+_DELETE = object()
+
+def atomic_write_text(path, content, mode):
+    """Write text to a temporary file and rename it over path"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the existing file's mode or honour the umask
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            pass
+        try:
+            os.chmod(tmp_path, mode)
+        except OSError:
+            # Some network mounts reject chmod; the write itself still matters more
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class BackgroundWriter:
+    """Write files on a background thread, keeping only the latest content per path"""
+    
+    def __init__(self, max_pending, submit_timeout, file_mode, status_ttl):
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        self.file_mode = file_mode
+        self.status_ttl = status_ttl
+        self._cond = threading.Condition()
+        # path -> (content, owner, futures) not yet picked up by the writer thread
+        self._pending = {}
+        self._order = collections.deque()
+        # path -> (content, owner) being written right now
+        self._in_flight = {}
+        # (owner, path) -> (message, monotonic time) of the last failed write
+        self._errors = {}
+        # owner -> (datetime, monotonic time) of the last successful write
+        self._last_saved = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='senti-nalysis-writer', daemon=True)
+        self._thread.start()
+    
+    def write(self, path, content, owner=None, block=True):
+        """Queue text to be written atomically to path, returning a Future for the commit"""
+        return self._submit(Path(path), content, owner, block)
+    
+    def delete(self, path, owner=None, block=True):
+        """Queue removal of path, returning a Future for the commit"""
+        return self._submit(Path(path), _DELETE, owner, block)
+    
+    def read_text(self, path):
+        """Read path, including writes that are queued but not yet on disk"""
+        path = Path(path)
+        with self._cond:
+            if path in self._pending:
+                content = self._pending[path][0]
+            elif path in self._in_flight:
+                content = self._in_flight[path][0]
+            else:
+                content = None
+        if content is _DELETE:
+            return None
+        if content is not None:
+            return content
+        if not path.exists():
+            return None
+        return path.read_text(encoding='utf-8')
+    
+    def status(self, owner):
+        """Summarize queued writes and recent failures submitted by one owner"""
+        with self._cond:
+            self._expire()
+            entries = list(self._pending.values()) + list(self._in_flight.values())
+            last_saved = self._last_saved.get(owner)
+            return {
+                'pending': sum(1 for entry in entries if entry[1] == owner),
+                'errors': [message for (error_owner, _), (message, _) in self._errors.items() if error_owner == owner],
+                'last_saved': last_saved[0] if last_saved else None
+            }
+    
+    def close(self, timeout=None):
+        """Flush queued writes and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+    
+    def _submit(self, path, content, owner, block):
+        future = concurrent.futures.Future()
+        with self._cond:
+            if not self._closed:
+                if path in self._pending:
+                    futures = self._pending[path][2]
+                else:
+                    has_room = self._cond.wait_for(
+                        lambda: len(self._pending) < self.max_pending,
+                        self.submit_timeout if block else 0
+                    )
+                    if not has_room:
+                        raise TimeoutError("Background write queue is full")
+                    self._order.append(path)
+                    futures = []
+                futures.append(future)
+                self._pending[path] = (content, owner, futures)
+                self._cond.notify_all()
+                return future
+        # Nothing will drain the queue any more, so write inline
+        self._commit(path, content, owner, [future])
+        return future
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._order or self._closed)
+                if not self._order:
+                    return
+                path = self._order.popleft()
+                content, owner, futures = self._pending.pop(path)
+                self._in_flight[path] = (content, owner)
+                self._cond.notify_all()
+            self._commit(path, content, owner, futures)
+    
+    def _commit(self, path, content, owner, futures):
+        error = None
+        try:
+            if content is _DELETE:
+                path.unlink(missing_ok=True)
+            else:
+                atomic_write_text(path, content, self.file_mode)
+        except Exception as e:
+            error = e
+        
+        with self._cond:
+            self._in_flight.pop(path, None)
+            if error:
+                self._errors[(owner, path)] = (f"{path.name}: {str(error)}", time.monotonic())
+            else:
+                self._errors.pop((owner, path), None)
+                self._last_saved[owner] = (datetime.now(), time.monotonic())
+            self._expire()
+            self._cond.notify_all()
+        
+        # Resolve outside the lock so callbacks can submit further writes
+        for future in futures:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(path)
+    
+    def _expire(self):
+        """Drop statuses older than the status TTL"""
+        now = time.monotonic()
+        for key, (_, failed_at) in list(self._errors.items()):
+            if now - failed_at > self.status_ttl:
+                del self._errors[key]
+        for owner, (_, saved_at) in list(self._last_saved.items()):
+            if now - saved_at > self.status_ttl:
+                del self._last_saved[owner]
+
+def get_new_file_mode():
+    """Get the mode open() gives new files, without touching the process umask"""
+    # os.umask can only be read by setting it, which races with other threads,
+    # so create a probe file and look at the mode it ends up with instead
+    probe = Path(tempfile.gettempdir()) / f'.senti-nalysis-umask-{uuid.uuid4().hex}'
+    try:
+        fd = os.open(probe, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            return stat.S_IMODE(os.fstat(fd).st_mode)
+        finally:
+            os.close(fd)
+            probe.unlink(missing_ok=True)
+    except OSError:
+        return 0o644
+
+@st.cache_resource
+def get_background_writer():
+    """Get the background writer shared by all browser sessions"""
+    writer = BackgroundWriter(
+        BACKGROUND_WRITE_QUEUE_SIZE,
+        BACKGROUND_WRITE_TIMEOUT_SECONDS,
+        get_new_file_mode(),
+        BACKGROUND_WRITE_STATUS_TTL_SECONDS
+    )
+    # Flush queued writes when the server shuts down
+    atexit.register(writer.close, BACKGROUND_WRITE_SHUTDOWN_TIMEOUT_SECONDS)
+    return writer
+
 # File management functions
 def get_available_files():
     """Get list of CSV files from documents directory"""
@@ -132,9 +358,9 @@ def load_completed_files():
     """Load list of completed files from a tracking file"""
     completed_file = Path(__file__).parent / '.completed_files.txt'
     try:
-        if completed_file.exists():
-            with open(completed_file, 'r') as f:
-                return [line.strip() for line in f.readlines()]
+        content = get_background_writer().read_text(completed_file)
+        if content is not None:
+            return [line.strip() for line in content.splitlines()]
     except (PermissionError, OSError):
         pass
     return []
@@ -143,8 +369,9 @@ def save_completed_files(completed_files):
     """Save list of completed files"""
     completed_file = Path(__file__).parent / '.completed_files.txt'
     try:
-        with open(completed_file, 'w') as f:
-            f.write('\n'.join(completed_files))
+        get_background_writer().write(
+            completed_file, '\n'.join(completed_files), owner=st.session_state.progress_session_id
+        )
     except (PermissionError, OSError):
         # Silently fail on read-only filesystems
         pass
@@ -160,8 +387,7 @@ def reset_completed_files():
     st.session_state.completed_files = []
     completed_file = Path(__file__).parent / '.completed_files.txt'
     try:
-        if completed_file.exists():
-            completed_file.unlink()
+        get_background_writer().delete(completed_file, owner=st.session_state.progress_session_id)
     except (PermissionError, OSError):
         pass
 
@@ -183,10 +409,10 @@ def check_for_saved_progress():
     try:
         progress_file = get_progress_file_path()
         
-        if progress_file.exists():
+        content = get_background_writer().read_text(progress_file)
+        if content is not None:
             try:
-                with open(progress_file, 'r', encoding='utf-8') as f:
-                    progress_data = json.load(f)
+                progress_data = json.loads(content)
                 return progress_data
             except Exception as e:
                 # Silently fail on corrupted progress file
@@ -196,25 +422,36 @@ def check_for_saved_progress():
         pass
     return None
 
-def save_progress_to_file():
-    """Save current progress to file"""
+def build_progress_data(username, selected_file, current_index, user_labels, csv_data):
+    """Build the progress payload written to the progress store"""
+    return {
+        'username': username,
+        'selected_file': selected_file,
+        'current_index': current_index,
+        'user_labels': user_labels,
+        'total_records': len(csv_data) if csv_data is not None else 0,
+        'timestamp': datetime.now().isoformat()
+    }
+
+def write_progress_data(progress_file, progress_data, owner=None, block=True):
+    """Queue a progress payload to be written to the given file"""
     import json
-    from datetime import datetime
     
+    return get_background_writer().write(progress_file, json.dumps(progress_data, indent=2), owner, block)
+
+def save_progress_to_file():
+    """Queue current progress to be saved to file"""
     progress_file = get_progress_file_path()
-    
-    progress_data = {
-        'username': st.session_state.username,
-        'selected_file': st.session_state.selected_file,
-        'current_index': st.session_state.current_index,
-        'user_labels': st.session_state.user_labels,
-        'total_records': len(st.session_state.csv_data) if st.session_state.csv_data is not None else 0,
-        'timestamp': datetime.now().isoformat()
-    }
+    progress_data = build_progress_data(
+        st.session_state.username,
+        st.session_state.selected_file,
+        st.session_state.current_index,
+        st.session_state.session_data.user_labels,
+        st.session_state.session_data.csv_data
+    )
     
     try:
-        with open(progress_file, 'w', encoding='utf-8') as f:
-            json.dump(progress_data, f, indent=2)
+        write_progress_data(progress_file, progress_data, owner=st.session_state.progress_session_id)
         return True
     except Exception as e:
         st.error(f"Error saving progress: {str(e)}")
@@ -223,11 +460,10 @@ def save_progress_to_file():
 def clear_saved_progress():
     """Clear saved progress file"""
     progress_file = get_progress_file_path()
-    if progress_file.exists():
-        try:
-            progress_file.unlink()
-        except Exception as e:
-            st.error(f"Error clearing progress: {str(e)}")
+    try:
+        get_background_writer().delete(progress_file, owner=st.session_state.progress_session_id)
+    except Exception as e:
+        st.error(f"Error clearing progress: {str(e)}")
 
 def load_progress_from_file(progress_data):
     """Load progress from saved data"""
@@ -236,11 +472,11 @@ def load_progress_from_file(progress_data):
         df = load_csv_file(progress_data['selected_file'])
         
         if df is not None:
-            st.session_state.csv_data = df
+            st.session_state.session_data.csv_data = df
             st.session_state.username = progress_data['username']
             st.session_state.selected_file = progress_data['selected_file']
             st.session_state.current_index = progress_data['current_index']
-            st.session_state.user_labels = progress_data['user_labels']
+            st.session_state.session_data.user_labels = progress_data['user_labels']
             st.session_state.stage = 'labeling'
             return True
         return False
@@ -248,6 +484,278 @@ def load_progress_from_file(progress_data):
         st.error(f"Error loading progress: {str(e)}")
         return False
 
+# Session memory management
+class SessionData:
+    """Labeling data held in memory for one browser session"""
+    
+    def __init__(self):
+        self.csv_data = None
+        self.user_labels = []
+        self.spilled = False
+        self.spilling = False
+        self.rehydrating = False
+        self.progress = {}
+        self.last_active = time.monotonic()
+    
+    @property
+    def csv_data(self):
+        return self._csv_data
+    
+    @csv_data.setter
+    def csv_data(self, df):
+        # Estimate once per load, not on every rerun: deep memory usage walks every cell
+        self._csv_data = df
+        self.memory_bytes = self.estimate_memory(df)
+    
+    @staticmethod
+    def estimate_memory(df):
+        """Estimate the memory held by a loaded CSV and one label per row"""
+        if df is None:
+            return 0
+        return int(df.memory_usage(deep=True).sum()) + sys.getsizeof([None] * len(df))
+
+class SessionManager:
+    """Track browser sessions and spill idle ones to the progress store"""
+    
+    # Sessions active more recently than this are never evicted, so a
+    # script run still using its data is not cleared from another thread
+    EVICTION_GRACE_SECONDS = 30
+    
+    def __init__(self, writer, spill_dir, idle_timeout, memory_budget, sweep_interval):
+        self.writer = writer
+        self.spill_dir = Path(spill_dir)
+        self.unrestored_dir = self.spill_dir / 'unrestored'
+        self.idle_timeout = max(idle_timeout, self.EVICTION_GRACE_SECONDS)
+        self.memory_budget = memory_budget
+        # Reentrant so a spill that completes immediately can free data in place
+        self._lock = threading.RLock()
+        # Weak references so the manager never keeps a closed session alive
+        self._sessions = {}
+        self._clear_stale_spills()
+        # Sweep periodically so idle sessions are spilled even without traffic
+        self._stop = threading.Event()
+        self._sweeper = threading.Thread(
+            target=self._sweep,
+            args=(weakref.ref(self), self._stop, sweep_interval),
+            name='senti-nalysis-sweeper',
+            daemon=True
+        )
+        self._sweeper.start()
+    
+    def activate(self, session_key, data, progress):
+        """Record activity for a session, rehydrating it first if it was spilled
+        
+        Returns None on success, or a message explaining why the session's
+        data could not be restored.
+        """
+        with self._lock:
+            rehydrate = data.spilled and not data.rehydrating
+            data.rehydrating = data.rehydrating or rehydrate
+            data.progress = progress
+            data.last_active = time.monotonic()
+            self._sessions[session_key] = weakref.ref(data)
+        
+        # Reload outside the lock so a slow volume only stalls this session
+        problem = self._rehydrate(session_key, data) if rehydrate else None
+        
+        with self._lock:
+            self._evict(exclude=session_key)
+        return problem
+    
+    def stats(self):
+        """Count resident and spilled sessions"""
+        with self._lock:
+            self._prune()
+            sessions = [data for data in (ref() for ref in self._sessions.values()) if data is not None]
+            spilled = sum(1 for data in sessions if data.spilled)
+            return {
+                'resident': len(sessions) - spilled,
+                'spilled': spilled,
+                'resident_bytes': sum(data.memory_bytes for data in sessions)
+            }
+    
+    def close(self):
+        """Stop the sweeper thread"""
+        self._stop.set()
+    
+    @staticmethod
+    def _sweep(manager_ref, stop, interval):
+        """Evict idle sessions on a timer until stopped or the manager is discarded"""
+        while not stop.wait(interval):
+            manager = manager_ref()
+            if manager is None:
+                return
+            with manager._lock:
+                manager._evict(exclude=None)
+            del manager
+    
+    def _spill_path(self, session_key):
+        return self.spill_dir / f'{session_key}.json'
+    
+    def _clear_stale_spills(self):
+        """Remove spill files left by a previous server process"""
+        # Their session ids lived in st.session_state, so nothing can rehydrate them
+        try:
+            self.spill_dir.mkdir(exist_ok=True)
+            for spill_file in self.spill_dir.glob('*.json'):
+                spill_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+    
+    def _prune(self):
+        """Forget sessions that Streamlit has already discarded"""
+        for session_key, ref in list(self._sessions.items()):
+            if ref() is None:
+                del self._sessions[session_key]
+                try:
+                    self.writer.delete(self._spill_path(session_key), block=False)
+                except OSError:
+                    pass
+    
+    def _evict(self, exclude):
+        """Spill idle sessions, then least recently used ones while over budget"""
+        self._prune()
+        now = time.monotonic()
+        candidates = []
+        for session_key, ref in self._sessions.items():
+            data = ref()
+            if data is None or session_key == exclude or data.spilled or data.spilling or data.csv_data is None:
+                continue
+            if now - data.last_active < self.EVICTION_GRACE_SECONDS:
+                continue
+            if now - data.last_active >= self.idle_timeout:
+                self._spill(session_key, data)
+            else:
+                candidates.append((data.last_active, session_key, data))
+        
+        resident_bytes = sum(
+            data.memory_bytes for data in (ref() for ref in self._sessions.values())
+            if data is not None and not data.spilling
+        )
+        for last_active, session_key, data in sorted(candidates, key=lambda c: c[0]):
+            if resident_bytes <= self.memory_budget:
+                break
+            freed = data.memory_bytes
+            if self._spill(session_key, data):
+                resident_bytes -= freed
+    
+    def _spill(self, session_key, data):
+        """Queue a session's progress for disk and free its data once it is written"""
+        import json
+        
+        progress_data = build_progress_data(
+            data.progress.get('username'),
+            data.progress.get('selected_file'),
+            data.progress.get('current_index'),
+            data.user_labels,
+            data.csv_data
+        )
+        try:
+            # Never wait for queue space while holding the manager lock
+            future = self.writer.write(
+                self._spill_path(session_key), json.dumps(progress_data, indent=2), block=False
+            )
+        except Exception:
+            # Keep the session resident and retry on a later sweep
+            return False
+        data.spilling = True
+        last_active = data.last_active
+        future.add_done_callback(lambda f: self._finish_spill(session_key, data, last_active, f))
+        return True
+    
+    def _finish_spill(self, session_key, data, last_active, future):
+        """Free a session's labeling data once its spill file is on disk"""
+        with self._lock:
+            data.spilling = False
+            # Keep the session resident if the write failed or it became active again
+            if future.exception() is not None:
+                return
+            if data.last_active == last_active:
+                data.csv_data = None
+                data.user_labels = []
+                data.spilled = True
+                return
+            # Remove the stale spill file before a newer spill of this session can be queued
+            try:
+                self.writer.delete(self._spill_path(session_key), block=False)
+            except OSError:
+                pass
+    
+    def _rehydrate(self, session_key, data):
+        """Reload a spilled session's CSV and labels, returning a message on failure"""
+        import json
+        
+        spill_file = self._spill_path(session_key)
+        content = None
+        progress_data = None
+        try:
+            content = self.writer.read_text(spill_file)
+            progress_data = json.loads(content)
+            df = load_csv_file(progress_data['selected_file'])
+        except Exception:
+            df = None
+        
+        if df is not None:
+            # The session is still marked spilled, so eviction leaves it alone meanwhile
+            data.csv_data = df
+            data.user_labels = progress_data['user_labels']
+        
+        with self._lock:
+            data.spilled = False
+            data.rehydrating = False
+            if df is None and content is not None:
+                # Keep the labels out of reach of the stale spill cleanup
+                kept_file = self.unrestored_dir / spill_file.name
+                try:
+                    self.unrestored_dir.mkdir(exist_ok=True)
+                    self.writer.write(kept_file, content, block=False)
+                    self.writer.delete(spill_file, block=False)
+                except OSError:
+                    return f"Your labels are still in `{spill_file}`."
+                return f"Your labels were kept in `{kept_file}`."
+            if df is None:
+                return "No saved labels were found for this session."
+            try:
+                self.writer.delete(spill_file, block=False)
+            except OSError:
+                pass
+        return None
+
+@st.cache_resource
+def get_session_manager():
+    """Get the session manager shared by all browser sessions"""
+    manager = SessionManager(
+        get_background_writer(),
+        get_progress_file_path().parent / 'sessions',
+        SESSION_IDLE_TIMEOUT_SECONDS,
+        SESSION_MEMORY_BUDGET_MB * 1024 * 1024,
+        SESSION_SWEEP_INTERVAL_SECONDS
+    )
+    atexit.register(manager.close)
+    return manager
+
+def sync_session_memory():
+    """Report activity to the session manager and restore spilled data"""
+    if st.session_state.progress_session_id is None:
+        st.session_state.progress_session_id = uuid.uuid4().hex
+    
+    progress = {
+        'username': st.session_state.username,
+        'selected_file': st.session_state.selected_file,
+        'current_index': st.session_state.current_index
+    }
+    problem = get_session_manager().activate(
+        st.session_state.progress_session_id,
+        st.session_state.session_data,
+        progress
+    )
+    
+    if problem:
+        # The shared progress file may belong to another annotator, so don't offer it here
+        st.warning(f"⚠️ Your idle session could not be restored. {problem} Please select a file to start again.")
+        st.session_state.stage = 'file_selection'
+        st.session_state.current_sentiment = None
+
 # Data processing functions
 def load_csv_file(filename):
     """Load and parse CSV file"""
@@ -273,7 +781,10 @@ def load_csv_file(filename):
         return None
 
 def save_report_to_results(username, filename, csv_content):
-    """Save completed report to results directory"""
+    """Queue completed report for the results directory
+    
+    Returns the output filename and a Future for the write, or None.
+    """
     results_dir = Path(__file__).parent / 'results'
     try:
         results_dir.mkdir(exist_ok=True)
@@ -295,10 +806,12 @@ def save_report_to_results(username, filename, csv_content):
     output_filename = f"{clean_username}_{filename_without_ext}-{timestamp}.csv"
     output_path = results_dir / output_filename
     
-    # Save file
+    # Queue file for the background writer
     try:
-        csv_content.to_csv(output_path, index=False)
-        return output_filename
+        future = get_background_writer().write(
+            output_path, csv_content.to_csv(index=False), owner=st.session_state.progress_session_id
+        )
+        return output_filename, future
     except (PermissionError, OSError) as e:
         st.warning(f"⚠️ Could not save to results directory: {str(e)}")
         return None
@@ -308,26 +821,26 @@ def start_labeling():
     """Start the labeling process"""
     st.session_state.stage = 'labeling'
     st.session_state.current_index = 0
-    st.session_state.user_labels = [None] * len(st.session_state.csv_data)
+    st.session_state.session_data.user_labels = [None] * len(st.session_state.session_data.csv_data)
     st.session_state.current_sentiment = None
 
 def submit_label(sentiment):
     """Submit current label and move to next record"""
-    st.session_state.user_labels[st.session_state.current_index] = sentiment
+    st.session_state.session_data.user_labels[st.session_state.current_index] = sentiment
     st.session_state.current_index += 1
     st.session_state.current_sentiment = None
     
     # Check if all records are labeled
-    if st.session_state.current_index >= len(st.session_state.csv_data):
+    if st.session_state.current_index >= len(st.session_state.session_data.csv_data):
         st.session_state.stage = 'complete'
 
 def reset_app():
     """Reset app to initial state"""
     clear_saved_progress()
     st.session_state.stage = 'check_resume'
-    st.session_state.csv_data = None
+    st.session_state.session_data.csv_data = None
     st.session_state.current_index = 0
-    st.session_state.user_labels = []
+    st.session_state.session_data.user_labels = []
     st.session_state.username = ''
     st.session_state.selected_file = None
     st.session_state.current_sentiment = None
@@ -336,7 +849,7 @@ def reset_app():
 def save_and_exit():
     """Save progress and return to home"""
     if save_progress_to_file():
-        st.success("✅ Progress saved successfully!")
+        st.success("💾 Progress queued for saving!")
         st.info("You can resume from where you left off when you return.")
         st.session_state.stage = 'check_resume'
         st.session_state.saved_progress = check_for_saved_progress()
@@ -352,6 +865,7 @@ def download_csv_data(df, filename):
 def main():
     """Main application logic"""
     init_session_state()
+    sync_session_memory()
     
     # Header with logo
     logo_path = Path(__file__).parent / 'images' / 'Senti-Nalysis_logo.png'
@@ -378,7 +892,7 @@ def main():
         if st.session_state.stage == 'labeling':
             st.metric("Current User", st.session_state.username)
             st.metric("Selected File", st.session_state.selected_file)
-            st.metric("Progress", f"{st.session_state.current_index}/{len(st.session_state.csv_data)}")
+            st.metric("Progress", f"{st.session_state.current_index}/{len(st.session_state.session_data.csv_data)}")
             
             st.divider()
             
@@ -386,6 +900,13 @@ def main():
                 save_and_exit()
         
         st.divider()
+        session_stats = get_session_manager().stats()
+        st.caption(
+            f"🧠 Sessions: {session_stats['resident']} resident / {session_stats['spilled']} spilled "
+            f"({session_stats['resident_bytes'] / (1024 * 1024):.1f} MB in memory)"
+        )
+        # Filled at the end of main(), after this run has queued its writes
+        write_status_container = st.container()
         st.info("💡 **Tips:**\n- Read each text carefully\n- Label based on overall sentiment\n- Save your work regularly")
     
     # Main content based on stage
@@ -397,6 +918,30 @@ def main():
         show_labeling_screen()
     elif st.session_state.stage == 'complete':
         show_complete_screen()
+    
+    with write_status_container:
+        show_write_status()
+
+@st.fragment(run_every=BACKGROUND_WRITE_STATUS_REFRESH_SECONDS)
+def show_write_status():
+    """Display this session's background save status, refreshing as writes finish"""
+    write_status = get_background_writer().status(st.session_state.progress_session_id)
+    if write_status['errors']:
+        st.caption(f"⚠️ Save failed: {write_status['errors'][0]}")
+    elif write_status['pending']:
+        st.caption(f"⏳ Saving {write_status['pending']} file(s)...")
+    elif write_status['last_saved']:
+        st.caption(f"✅ All changes saved at {write_status['last_saved'].strftime('%H:%M:%S')}")
+
+@st.fragment(run_every=BACKGROUND_WRITE_STATUS_REFRESH_SECONDS)
+def show_report_status(output_filename, report_write):
+    """Display whether the results report has been written, refreshing until it is"""
+    if not report_write.done():
+        st.info(f"⏳ Saving report to results directory as: **{output_filename}**")
+    elif report_write.exception() is not None:
+        st.warning(f"⚠️ Could not save to results directory: {str(report_write.exception())}. Download button still works!")
+    else:
+        st.success(f"✅ Report saved to results directory as: **{output_filename}**")
 
 def show_resume_screen():
     """Display resume or start new session screen"""
@@ -523,7 +1068,7 @@ def show_file_selection_screen():
                 df = load_csv_file(selected_file)
                 
                 if df is not None and not df.empty:
-                    st.session_state.csv_data = df
+                    st.session_state.session_data.csv_data = df
                     st.session_state.username = username
                     st.session_state.selected_file = selected_file
                     start_labeling()
@@ -533,23 +1078,23 @@ def show_file_selection_screen():
 
 def show_labeling_screen():
     """Display labeling screen"""
-    if st.session_state.csv_data is None:
+    if st.session_state.session_data.csv_data is None:
         st.error("No data loaded!")
         reset_app()
         st.rerun()
         return
     
     # Progress bar
-    progress = (st.session_state.current_index) / len(st.session_state.csv_data)
+    progress = (st.session_state.current_index) / len(st.session_state.session_data.csv_data)
     st.progress(progress)
     st.markdown(f"""
     <div class="progress-container">
-        <h3 style="margin:0;">Progress: Record {st.session_state.current_index + 1} of {len(st.session_state.csv_data)}</h3>
+        <h3 style="margin:0;">Progress: Record {st.session_state.current_index + 1} of {len(st.session_state.session_data.csv_data)}</h3>
     </div>
     """, unsafe_allow_html=True)
     
     # Get current record
-    current_record = st.session_state.csv_data.iloc[st.session_state.current_index]
+    current_record = st.session_state.session_data.csv_data.iloc[st.session_state.current_index]
     
     # Display record
     st.markdown(f"""
@@ -606,35 +1151,35 @@ def show_complete_screen():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Records", len(st.session_state.csv_data))
+        st.metric("Total Records", len(st.session_state.session_data.csv_data))
     
     with col2:
-        positive_count = st.session_state.user_labels.count('positive')
+        positive_count = st.session_state.session_data.user_labels.count('positive')
         st.metric("Positive", positive_count)
     
     with col3:
-        neutral_count = st.session_state.user_labels.count('neutral')
-        negative_count = st.session_state.user_labels.count('negative')
+        neutral_count = st.session_state.session_data.user_labels.count('neutral')
+        negative_count = st.session_state.session_data.user_labels.count('negative')
         st.metric("Neutral / Negative", f"{neutral_count} / {negative_count}")
     
     # Prepare download data
     column_name = f"sentiment_by_{st.session_state.username.replace(' ', '_')}"
     
     download_df = pd.DataFrame({
-        'user': st.session_state.csv_data['user'],
-        'text': st.session_state.csv_data['text'],
-        column_name: st.session_state.user_labels
+        'user': st.session_state.session_data.csv_data['user'],
+        'text': st.session_state.session_data.csv_data['text'],
+        column_name: st.session_state.session_data.user_labels
     })
     
     # Save to results directory
     try:
-        output_filename = save_report_to_results(
+        report = save_report_to_results(
             st.session_state.username,
             st.session_state.selected_file,
             download_df
         )
-        if output_filename:
-            st.success(f"✅ Report saved to results directory as: **{output_filename}**")
+        if report:
+            show_report_status(*report)
     except Exception as e:
         st.warning(f"⚠️ Could not save to results directory (read-only filesystem). Download button still works!")
     